@@ -11,8 +11,6 @@ __email__		= "chris@ouroboroscoding.com"
 __created__		= "2025-02-08"
 
 # Python imports
-from os.path import abspath, expanduser
-from pathlib import Path
 from sys import argv, exit, stderr
 
 # Module imports
@@ -12,9 +12,9 @@ __created__		= "2025-01-08"
 
 # Ouroboros imports
 from config import config
-import jsonb
 
 # Python imports
+import orjson
 from os.path import isfile
 
 def install():
@@ -48,8 +48,8 @@ def install():
 				break
 
 	# Store the base config files using the path
-	with open(sFile, 'w') as oF:
-		oF.write(jsonb.encode({
+	with open(sFile, 'wb') as oF:
+		oF.write(orjson.dumps({
 			'rest': {},
 			'portals': {}
 		}))
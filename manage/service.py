@@ -19,19 +19,59 @@ from brain.helpers import access
 from config import config
 from define import Parent
 from jobject import jobject
-import jsonb
-from tools import clone, combine, evaluate
+from tools import combine, evaluate
 
 # Python imports
-import arrow
-from os import scandir
-from os.path import abspath, expanduser, isdir, isfile
-from pathlib import Path
+from collections.abc import Callable
+from datetime import datetime, timezone
+from functools import lru_cache
+import orjson
+from os import close, environ, fchmod, fchown, fdopen, fsync, O_RDONLY, \
+	open as os_open, remove, replace, scandir, stat
+from os.path import abspath, basename, dirname, expanduser, isdir, isfile, \
+	join, realpath
+from stat import S_IFDIR, S_IFMT, S_IFREG, S_IMODE
 import subprocess
+from tempfile import mkstemp
+from time import monotonic
 
 # Project imports
 from .errors import SHELL_ISSUE
 
+_DEFINE = join(dirname(abspath(__file__)), 'define')
+"""The folder holding the definition files"""
+
+@lru_cache(maxsize = None)
+def _definition_file(name: str) -> bytes:
+	"""Definition File
+
+	Reads a definition file. Each file is only read once per process no matter \
+	how many times the service is created or reset
+
+	Arguments:
+		name (str): The name of the file in the define folder
+
+	Returns:
+		bytes
+	"""
+	with open(join(_DEFINE, name), 'rb') as oF:
+		return oF.read()
+
+def _definition(name: str) -> Parent:
+	"""Definition
+
+	Creates a new Parent from a definition file. The file is cached, but each \
+	call gets its own Parent, as Parents store the failures of their last \
+	validation and can't be shared between instances or threads
+
+	Arguments:
+		name (str): The name of the file in the define folder
+
+	Returns:
+		Parent
+	"""
+	return Parent(orjson.loads(_definition_file(name)))
+
 class Manage(Service):
 	"""Manage Service class
 
@@ -44,6 +84,27 @@ class Manage(Service):
 		manage
 	"""
 
+	_PORTAL_PATHS = (
+		( None, 'path', S_IFDIR, False, 'not a valid directory' ),
+		( None, 'web_root', S_IFDIR, False, 'not a valid directory' ),
+		( None, 'backups', S_IFDIR, True, 'not a valid directory' )
+	)
+	"""The path fields of portals, as ( section, key, kind, optional, error )"""
+
+	_REST_PATHS = (
+		( None, 'path', S_IFDIR, False, 'not a valid directory' ),
+		( 'python', 'which', S_IFREG, True, 'not found' ),
+		( 'python', 'requirements', S_IFREG, True, 'not found' )
+	)
+	"""The path fields of REST entries, as ( section, key, kind, optional, \
+	error )"""
+
+	_SECTIONS = {
+		'portals': ( 'manage_portal', 'portal' ),
+		'rest': ( 'manage_rest', 'rest' )
+	}
+	"""The permission and record name of each section of the config"""
+
 	@classmethod
 	def _real(cls, path: str) -> str:
 		"""Real
@@ -57,9 +118,293 @@ class Manage(Service):
 			str
 		"""
 		return abspath(
-			'~' in path and expanduser(path) or path
+			path.startswith('~') and expanduser(path) or path
+		)
+
+	@classmethod
+	def _check_path(cls, path: str, kind: int, cache: dict) -> bool:
+		"""Check Path
+
+		Turns the path into an absolute one and checks its type using a single \
+		stat call. The mode is kept in the cache, keyed by the absolute path, \
+		so checking the same path twice in one validation only hits the disk \
+		once. Paths already known to be valid can be added to the cache ahead \
+		of time to skip the stat entirely
+
+		Arguments:
+			path (str): The path to check
+			kind (int): The type of file expected, S_IFDIR or S_IFREG
+			cache (dict): The modes already fetched for this validation
+
+		Returns:
+			bool
+		"""
+
+		# Get the absolute path
+		sPath = cls._real(path)
+
+		# If we don't have it yet, stat it, using 0 for anything missing
+		try:
+			iMode = cache[sPath]
+		except KeyError:
+			try:
+				iMode = stat(sPath).st_mode
+			except ( OSError, ValueError ):
+				iMode = 0
+			cache[sPath] = iMode
+
+		# Return if the type matches
+		return S_IFMT(iMode) == kind
+
+	def _check_paths(self,
+		data: dict,
+		fields: tuple,
+		previous: dict | None,
+		error_list: list
+	) -> dict:
+		"""Check Paths
+
+		Strips and checks each of the path fields of a record, adding any \
+		problems to the error list. Optional fields that are missing or empty are \
+		set to null. Paths in the previous version of the record were already \
+		validated, so unchanged ones aren't checked again
+
+		Arguments:
+			data (dict): The record to check
+			fields (tuple): The fields to check, as ( section, key, kind, \
+				optional, error ) tuples
+			previous (dict | None): The previous version of the record, if any
+			error_list (list): The list to add any errors to
+
+		Returns:
+			dict
+		"""
+
+		# Init the paths already checked
+		dPaths = {}
+
+		# If we have a previous version, store its paths as already checked
+		if previous:
+			for sSection, sKey, iKind, _, _ in fields:
+				d = previous[sSection] if sSection else previous
+				if d.get(sKey):
+					dPaths[self._real(d[sKey])] = iKind
+
+		# Go through each field
+		for sSection, sKey, iKind, bOptional, sError in fields:
+
+			# Get the part of the record the field is in
+			d = data[sSection] if sSection else data
+
+			# Strip pre/post whitespace
+			sPath = d.get(sKey)
+			if sPath:
+				sPath = d[sKey] = sPath.strip()
+
+			# If it's optional and empty, set it to null and move on
+			if not sPath and bOptional:
+				d[sKey] = None
+				continue
+
+			# If it's not valid, add the error
+			if not self._check_path(sPath, iKind, dPaths):
+				sName = sSection and f'{sSection}.{sKey}' or sKey
+				error_list.append(( f'record.{sName}', sError ))
+
+		# Return the paths checked so the caller can reuse them
+		return dPaths
+
+	def _entry_create(self,
+		req: jobject,
+		section: str,
+		validation: Callable[[str, dict], Response]
+	) -> Response:
+		"""Entry create
+
+		Shared code for creating a new entry in a section of the config
+
+		Arguments:
+			req (jobject): The request details, which can include 'data', \
+						'environment', and 'session'
+			section (str): The section of the config, 'portals' or 'rest'
+			validation (Callable): The method to validate and store the entry
+
+		Returns:
+			Response
+		"""
+
+		# Verify the permissions
+		access.verify(
+			req.session,
+			{ 'name': self._SECTIONS[section][0], 'right': access.CREATE }
+		)
+
+		# Verify minimum data
+		try: evaluate(req.data, [ 'name', 'record' ])
+		except ValueError as e:
+			return Error(
+				errors.DATA_FIELDS, [ ( f, 'missing' ) for f in e.args ]
+			)
+
+		# If there's another entry with that name
+		if req.data.name in self._conf[section]:
+			return Error(errors.DB_DUPLICATE, [ req.data.name, section ])
+
+		# Call and return the validation method
+		return validation(req.data.name, req.data.record)
+
+	def _entry_delete(self, req: jobject, section: str) -> Response:
+		"""Entry delete
+
+		Shared code for deleting an entry in a section of the config by name
+
+		Arguments:
+			req (jobject): The request details, which can include 'data', \
+						'environment', and 'session'
+			section (str): The section of the config, 'portals' or 'rest'
+
+		Returns:
+			Response
+		"""
+
+		# Get the permission and name of the section
+		sPermission, sName = self._SECTIONS[section]
+
+		# Verify the permissions
+		access.verify(
+			req.session, { 'name': sPermission, 'right': access.DELETE }
+		)
+
+		# Verify minimum data
+		try: evaluate(req.data, [ 'name' ])
+		except ValueError as e:
+			return Error(
+				errors.DATA_FIELDS, [ ( f, 'missing' ) for f in e.args ]
+			)
+
+		# If the entry doesn't exist
+		if req.data.name not in self._conf[section]:
+			return Error(errors.DB_NO_RECORD, [ req.data.name, sName ])
+
+		# Remove the entry from the config, keeping it in case we need to roll
+		#	back
+		dPrevious = self._conf[section].pop(req.data.name)
+
+		# Store the conf
+		try:
+			self._store(self._conf)
+
+		# If we couldn't, restore the entry
+		except Exception as e:
+			self._conf[section][req.data.name] = dPrevious
+			return Error(errors.DB_CREATE_FAILED, str(e))
+
+		# Return OK
+		return Response(True)
+
+	def _entry_read(self, req: jobject, section: str) -> Response:
+		"""Entry read
+
+		Shared code for returning all the entries in a section of the config
+
+		Arguments:
+			req (jobject): The request details, which can include 'data', \
+						'environment', and 'session'
+			section (str): The section of the config, 'portals' or 'rest'
+
+		Returns:
+			Response
+		"""
+
+		# Verify the permissions
+		access.verify(
+			req.session,
+			{ 'name': self._SECTIONS[section][0], 'right': access.READ }
 		)
 
+		# Return the entries
+		return Response(self._conf[section])
+
+	def _entry_update(self,
+		req: jobject,
+		section: str,
+		merge: Callable[[dict, dict], dict],
+		validation: Callable[[str, dict], Response]
+	) -> Response:
+		"""Entry update
+
+		Shared code for updating an existing entry in a section of the config \
+		by name
+
+		Arguments:
+			req (jobject): The request details, which can include 'data', \
+						'environment', and 'session'
+			section (str): The section of the config, 'portals' or 'rest'
+			merge (Callable): Makes the new entry from the existing one and \
+				the changes
+			validation (Callable): The method to validate and store the entry
+
+		Returns:
+			Response
+		"""
+
+		# Get the permission and name of the section
+		sPermission, sName = self._SECTIONS[section]
+
+		# Verify the permissions
+		access.verify(
+			req.session, { 'name': sPermission, 'right': access.UPDATE }
+		)
+
+		# Verify minimum data
+		try: evaluate(req.data, [ 'name', 'record' ])
+		except ValueError as e:
+			return Error(
+				errors.DATA_FIELDS, [ ( f, 'missing' ) for f in e.args ]
+			)
+
+		# If the entry doesn't exist
+		if req.data.name not in self._conf[section]:
+			return Error(errors.DB_NO_RECORD, [ req.data.name, sName ])
+
+		# Make a new entry from the old and new data, then call and return the
+		#	validation method
+		return validation(
+			req.data.name,
+			merge(self._conf[section][req.data.name], req.data.record)
+		)
+
+	def _nvm_alias(self, alias: str) -> bool:
+		"""NVM Alias
+
+		Returns whether the alias is known to nvm by checking for its file in \
+		the nvm alias folder, rather than starting a shell to ask nvm itself. \
+		Valid aliases are remembered until the next reset
+
+		Arguments:
+			alias (str): The alias to check
+
+		Returns:
+			bool
+		"""
+
+		# If we've already seen it, it's valid
+		if alias in self._nvm_alias_seen:
+			return True
+
+		# Don't allow anything that could take us outside the alias folder
+		if alias[0] == '/' or '..' in alias.split('/'):
+			return False
+
+		# If it's not one of nvm's built in aliases, and there's no file for it
+		if alias not in ( 'iojs', 'node', 'stable', 'unstable' ) and \
+			not isfile(join(self._nvm_alias_dir, alias)):
+			return False
+
+		# Remember it and return OK
+		self._nvm_alias_seen.add(alias)
+		return True
+
 	def _portal_validation(self, name: str, data: dict) -> Response:
 		"""Portal Validation
 
@@ -77,106 +422,66 @@ class Manage(Service):
 		if not self._portal.valid(data):
 			return Error(
 				errors.DATA_FIELDS,
-				[ [ 'record.%s' % l[0], l[1] ] \
+				[ ( f'record.{l[0]}', l[1] ) \
 	 				for l in self._portal._validation_failures ]
 			)
 
 		# Init possible file errors
 		lErrors = []
 
-		# Strip pre/post whitespace
-		data.path = data.path.strip()
+		# Keep the existing entry, if any, so unchanged paths aren't checked
+		#	again, and in case we need to roll back
+		dPrevious = self._conf.portals.get(name)
 
-		# If it's not a valid directory
-		if not isdir(self._real(data.path)):
-			lErrors.append([ 'record.path', 'not a valid directory' ])
+		# Check the folders
+		dPaths = self._check_paths(data, self._PORTAL_PATHS, dPrevious, lErrors)
 
 		# If we have a 'build' argument
-		if 'build' in data and data.build:
+		sBuild = data.get('build')
+		if sBuild:
 
 			# Strip pre/post whitespace
-			data.build = data.build.strip()
+			data['build'] = sBuild = sBuild.strip()
 
 			# If it's not a valid directory
-			if not isdir(self._real(data.build)):
+			if not self._check_path(sBuild, S_IFDIR, dPaths):
 
 				# Check the parent
-				if not isdir(Path(self._real(data.build)).parent.resolve()):
-					lErrors.append([ 'record.build', 'not a valid directory' ])
-
-		# Strip pre/post whitespace
-		data.web_root = data.web_root.strip()
+				if not self._check_path(
+					dirname(self._real(sBuild)), S_IFDIR, dPaths
+				):
+					lErrors.append(( 'record.build', 'not a valid directory' ))
 
-		# If it's not a valid directory
-		if not isdir(self._real(data.web_root)):
-			lErrors.append([ 'record.web_root', 'not a valid directory' ])
+		# Strip pre/post whitespace from the 'nvm' argument, setting it to null
+		#	if it's missing or empty
+		dNode = data['node']
+		sNvm = dNode.get('nvm')
+		dNode['nvm'] = sNvm = sNvm and sNvm.strip() or None
 
-		# If we have a 'backups' argument
-		if 'backups' in data and data.backups:
-
-			# Strip pre/post whitespace
-			data.backups = data.backups.strip()
-
-			# If it's not a valid directory
-			if not isdir(self._real(data.backups)):
-				lErrors.append([ 'record.backups', 'not a valid directory' ])
-
-		# If we have an 'nvm' argument
-		if 'nvm' in data.node and data.node.nvm:
-
-			# Strip pre/post whitespace
-			data.node.nvm = data.node.nvm.strip()
-
-			# If we have a value
-			if data.node.nvm:
-
-				# Run NVM
-				try:
-					sOut = subprocess.check_output(
-						'bash -c ". %s && nvm alias %s"' % (
-							self._real('~/.nvm/nvm.sh'),
-							data.node.nvm
-						),
-						shell = True,
-						stderr = subprocess.STDOUT
-					).decode().strip()
-
-					# If we got not nothing
-					if not sOut:
-						lErrors.append([ 'record.node.nvm', 'invalid alias' ])
-
-				# If there was an error
-				except subprocess.CalledProcessError as e:
-					print(e)
-					lErrors.append([ 'record.node.nvm', str(e.args) ])
-
-			# Else, set it to null
-			else:
-				data.node.nvm = None
-
-		# Else, set it to null
-		else:
-			data.node.nvm = None
+		# If we have an alias, and it's not a known one
+		if sNvm and not self._nvm_alias(sNvm):
+			lErrors.append(( 'record.node.nvm', 'invalid alias' ))
 
 		# If there's errors
 		if lErrors:
 			return Error(errors.DATA_FIELDS, lErrors)
 
-		# Copy the config
-		dConf = clone(self._conf)
-
-		# Add the new entry
-		dConf.portals[name] = data
+		# Add the new entry directly to the config, the existing entry, if any,
+		#	is still in dPrevious in case we need to roll back
+		self._conf.portals[name] = data
 
 		# Store the conf
 		try:
-			jsonb.store(dConf, self._path, 2)
+			self._store(self._conf)
+
+		# If we couldn't, restore the previous entry
 		except Exception as e:
+			if dPrevious is None:
+				del self._conf.portals[name]
+			else:
+				self._conf.portals[name] = dPrevious
 			return Error(errors.DB_CREATE_FAILED, str(e))
 
-		# Update the local variables
-		self._conf = dConf
-
 		# Return OK
 		return Response(True)
 
@@ -202,7 +507,7 @@ class Manage(Service):
 		try: evaluate(req.data, [ 'name' ])
 		except ValueError as e:
 			return Error(
-				errors.DATA_FIELDS, [ [ f, 'missing' ] for f in e.args ]
+				errors.DATA_FIELDS, [ ( f, 'missing' ) for f in e.args ]
 			)
 
 		# If the portal doesn't exist
@@ -210,8 +515,7 @@ class Manage(Service):
 			return Error(errors.DB_NO_RECORD, [ req.data.name, 'portal' ])
 
 		# If the portal doesn't allow backups
-		if 'backups' not in self._conf.portals[req.data.name] or \
-			not self._conf.portals[req.data.name].backups:
+		if not self._conf.portals[req.data.name].get('backups'):
 			return Error(errors.RIGHTS, 'portal does not allow backups')
 
 		# Get all the folders currently in the backups folder, sort them by
@@ -251,7 +555,7 @@ class Manage(Service):
 		try: evaluate(req.data, [ 'name' ])
 		except ValueError as e:
 			return Error(
-				errors.DATA_FIELDS, [ [ f, 'missing' ] for f in e.args ]
+				errors.DATA_FIELDS, [ ( f, 'missing' ) for f in e.args ]
 			)
 
 		# If the portal doesn't exist
@@ -268,12 +572,13 @@ class Manage(Service):
 		]
 
 		# If we have a clear flag
-		if 'clear' in req.data and req.data['clear']:
+		if req.data.get('clear'):
 			lCommands.append('%s checkout .' % self._git)
 
 		# If we have a checkout branch, add the checkout part
-		if 'checkout' in req.data and req.data.checkout:
-			lCommands.append('%s checkout %s' % ( self._git, req.data.checkout ))
+		sCheckout = req.data.get('checkout')
+		if sCheckout:
+			lCommands.append('%s checkout %s' % ( self._git, sCheckout ))
 
 		# git pull
 		lCommands.append(dPortal.git.submodules and \
@@ -284,7 +589,7 @@ class Manage(Service):
 		# If we have an nvm alias, add the nvm part
 		if dPortal.node.nvm:
 			lCommands.extend([
-				'. %s' % self._real('~/.nvm/nvm.sh'),
+				'. %s/nvm.sh' % self._nvm_dir,
 				'nvm alias %s' % dPortal.node.nvm
 			])
 
@@ -298,12 +603,11 @@ class Manage(Service):
 		lCommands.append('npm run %s' % dPortal.node.script or 'build')
 
 		# If we allow and need a backup
-		if 'backups' in dPortal and dPortal.backups and \
-			'backup' in req.data and req.data.backup:
+		if dPortal.get('backups') and req.data.get('backup'):
 			lCommands.append('(mv -v %s %s/%s || true)' % (
 				self._real(dPortal.web_root),
 				self._real(dPortal.backups),
-				arrow.get().format('YYYYMMDDHHmmss')
+				datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')
 			))
 		else:
 			lCommands.append('rm -Rf %s' % self._real(dPortal.web_root))
@@ -312,10 +616,9 @@ class Manage(Service):
 		lCommands.extend([
 			'mkdir -vp %s' % self._real(dPortal.web_root),
 			'cp -vr %s/* %s/.' % (
-				self._real(('build' in dPortal and \
-					dPortal.build or \
-					('%s/dist' % dPortal.path)
-				)),
+				self._real(
+					dPortal.get('build') or ('%s/dist' % dPortal.path)
+				),
 				self._real(dPortal.web_root)
 		)])
 
@@ -363,7 +666,7 @@ class Manage(Service):
 		try: evaluate(req.data, [ 'name' ])
 		except ValueError as e:
 			return Error(
-				errors.DATA_FIELDS, [ [ f, 'missing' ] for f in e.args ]
+				errors.DATA_FIELDS, [ ( f, 'missing' ) for f in e.args ]
 			)
 
 		# If the portal doesn't exist
@@ -376,15 +679,8 @@ class Manage(Service):
 		# Init return
 		dRet = jobject({})
 
-		# Copy the folder
-		sDir = dPortal.path
-
-		# If the portal has ~
-		if '~' in sDir:
-			sDir = expanduser(sDir)
-
-		# Make it an absolute path
-		sDir = abspath(sDir)
+		# Get the absolute path to the folder
+		sDir = self._real(dPortal.path)
 
 		# Get the repo up to date
 		try:
@@ -449,24 +745,8 @@ class Manage(Service):
 			Response
 		"""
 
-		# Verify the permissions
-		access.verify(
-			req.session, { 'name': 'manage_portal', 'right': access.CREATE }
-		)
-
-		# Verify minimum data
-		try: evaluate(req.data, [ 'name', 'record' ])
-		except ValueError as e:
-			return Error(
-				errors.DATA_FIELDS, [ [ f, 'missing' ] for f in e.args ]
-			)
-
-		# If there's another portal with that name
-		if req.data.name in self._conf.portals:
-			return Error(errors.DB_DUPLICATE, [ req.data.name, 'portals' ])
-
-		# Call and return the validation methods
-		return self._portal_validation(req.data.name, req.data.record)
+		# Create the entry
+		return self._entry_create(req, 'portals', self._portal_validation)
 
 	def portal_delete(self, req: jobject) -> Response:
 		"""Portal delete
@@ -481,39 +761,8 @@ class Manage(Service):
 			Response
 		"""
 
-		# Verify the permissions
-		access.verify(
-			req.session, { 'name': 'manage_portal', 'right': access.DELETE }
-		)
-
-		# Verify minimum data
-		try: evaluate(req.data, [ 'name' ])
-		except ValueError as e:
-			return Error(
-				errors.DATA_FIELDS, [ [ f, 'missing' ] for f in e.args ]
-			)
-
-		# If the portal doesn't exist
-		if req.data.name not in self._conf.portals:
-			return Error(errors.DB_NO_RECORD, [ req.data.name, 'portal' ])
-
-		# Copy the config
-		dConf = clone(self._conf)
-
-		# Delete the portal
-		del dConf.portals[req.data.name]
-
-		# Store the conf
-		try:
-			jsonb.store(dConf, self._path, 2)
-		except Exception as e:
-			return Error(errors.DB_CREATE_FAILED, str(e))
-
-		# Update the local variables
-		self._conf = dConf
-
-		# Return OK
-		return Response(True)
+		# Delete the entry
+		return self._entry_delete(req, 'portals')
 
 	def portal_restore_create(self, req: jobject) -> Response:
 		"""Portal update
@@ -537,7 +786,7 @@ class Manage(Service):
 		try: evaluate(req.data, [ 'name', 'backup' ])
 		except ValueError as e:
 			return Error(
-				errors.DATA_FIELDS, [ [ f, 'missing' ] for f in e.args ]
+				errors.DATA_FIELDS, [ ( f, 'missing' ) for f in e.args ]
 			)
 
 		# If the portal doesn't exist
@@ -554,7 +803,7 @@ class Manage(Service):
 			req.data.backup
 		)):
 			return Error(
-				errors.DATA_FIELDS, [ [ 'backup', 'folder not found' ] ]
+				errors.DATA_FIELDS, [ ( 'backup', 'folder not found' ) ]
 			)
 
 		# Simplify life
@@ -564,7 +813,7 @@ class Manage(Service):
 		lCommands = []
 
 		# If we want to first backup the current version
-		if 'backup_current' in req.data and req.data.backup_current:
+		if req.data.get('backup_current'):
 			lCommands.append('mv -v %s %s/previous' % (
 				self._real(dPortal.web_root),
 				self._real(dPortal.backups)
@@ -618,28 +867,11 @@ class Manage(Service):
 			Response
 		"""
 
-		# Verify the permissions
-		access.verify(
-			req.session, { 'name': 'manage_portal', 'right': access.UPDATE }
+		# Update the entry
+		return self._entry_update(
+			req, 'portals', combine, self._portal_validation
 		)
 
-		# Verify minimum data
-		try: evaluate(req.data, [ 'name', 'record' ])
-		except ValueError as e:
-			return Error(
-				errors.DATA_FIELDS, [ [ f, 'missing' ] for f in e.args ]
-			)
-
-		# If the portal doesn't exist
-		if req.data.name not in self._conf.portals:
-			return Error(errors.DB_NO_RECORD, [ req.data.name, 'portal' ])
-
-		# Make a new record from the old and new data
-		dRest = combine(self._conf.portals[req.data.name], req.data.record)
-
-		# Call and return the validation methods
-		return self._portal_validation(req.data.name, dRest)
-
 	def portals_read(self, req: jobject) -> Response:
 		"""Portals read
 
@@ -653,13 +885,39 @@ class Manage(Service):
 			Response
 		"""
 
-		# Verify the permissions
-		access.verify(
-			req.session, { 'name': 'manage_portal', 'right': access.READ }
-		)
+		# Return the entries
+		return self._entry_read(req, 'portals')
+
+	@staticmethod
+	def _rest_merge(current: dict, record: dict) -> dict:
+		"""Rest Merge
 
-		# Return the services
-		return Response(self._conf.portals)
+		Makes a new REST entry from the existing one and the changes. Services \
+		sent are used as is rather than combined, and any set to None are \
+		dropped
+
+		Arguments:
+			current (dict): The existing entry
+			record (dict): The changes to the entry
+
+		Returns:
+			dict
+		"""
+
+		# Make a new record from the old and new data
+		dRest = combine(current, record)
+
+		# If we specifically changed services
+		if 'services' in record:
+			dRest['services'] = record.services
+
+		# Drop any services set to None
+		dRest.services = jobject({
+			k: v for k, v in dRest.services.items() if v is not None
+		})
+
+		# Return the new record
+		return dRest
 
 	def _rest_validation(self, name: str, data: dict) -> Response:
 		"""Rest Validation
@@ -678,142 +936,78 @@ class Manage(Service):
 		if not self._rest.valid(data):
 			return Error(
 				errors.DATA_FIELDS,
-				[ [ 'record.%s' % l[0], l[1] ] \
+				[ ( f'record.{l[0]}', l[1] ) \
 	 				for l in self._rest._validation_failures ]
 			)
 
 		# Init possible file errors
 		lErrors = []
 
-		# Strip pre/post whitespace
-		data.path = data.path.strip()
-
-		# If it's not a valid directory
-		if not isdir(self._real(data.path)):
-			lErrors.append([ 'record.path', 'not a valid directory' ])
-
-		# If we have a 'which' argument
-		if 'which' in data.python and data.python.which:
-
-			# Strip pre/post whitespace
-			data.python.which = data.python.which.strip()
-
-			# If it's not empty
-			if data.python.which:
-
-				# If it's not a valid file
-				if not isfile(self._real(data.python.which)):
-					lErrors.append([ 'record.python.which', 'not found' ])
-
-			# Else, set it to null
-			else:
-				data.python.which = None
-
-		# Else, set it to null
-		else:
-			data.python.which = None
-
-		# If we have a 'requirements' argument
-		if 'requirements' in data.python and data.python.requirements:
-
-			# Strip pre/post whitespace
-			data.python.requirements = data.python.requirements.strip()
-
-			# If it's not empty
-			if data.python.requirements:
-
-				# If it's not a valid file
-				if not isfile(self._real(data.python.requirements)):
-					lErrors.append(
-						[ 'record.python.requirements', 'not found' ]
-					)
-
-			# Else, set it to null
-			else:
-				data.python.requirements = None
+		# Keep the existing entry, if any, so unchanged paths aren't checked
+		#	again, and in case we need to roll back
+		dPrevious = self._conf.rest.get(name)
 
-		# Else, set it to null
-		else:
-			data.python.requirements = None
+		# Check the folder and files
+		self._check_paths(data, self._REST_PATHS, dPrevious, lErrors)
 
-		# Try to call a subprocess
+		# Fetch the list of supervisor programs
 		try:
+			lPrograms = self._supervisor_programs()
 
-			# Fetch the list of supervisor programs and store just the name
-			lOut = subprocess.check_output(
-				'supervisorctl avail',
-				shell = True
-			).decode().split('\n')
-
-			# Init the list of programs
-			lPrograms = []
-
-			# Go though each line, get the program, and add it to the list
-			for s in lOut:
-				if s != '':
-					l = s.split(' ', 1)
-					lPrograms.append(l[0])
-
-		# If there's any issue with the process
-		except subprocess.CalledProcessError as e:
-			lErrors.append([ 'record.services', str(e.args) ])
+		# If there's any issue with the process, or it couldn't be found, we
+		#	have nothing to check the services against
+		except ( OSError, subprocess.CalledProcessError ) as e:
+			lPrograms = None
+			lErrors.append(( 'record.services', str(e.args) ))
 
 		# Step through the services
-		for k, d in data.services.items():
-
-			# If we have a 'supervisor' argument
-			if 'supervisor' in d and d.supervisor:
-
-				# Strip pre/post whitespace
-				d.supervisor = d.supervisor.strip()
+		for k, d in data['services'].items():
 
-				# If we have a value
-				if d.supervisor:
-					pass
+			# Strip pre/post whitespace from the 'supervisor' argument, setting
+			#	it to null if it's missing or empty
+			sProgram = d.get('supervisor')
+			d['supervisor'] = sProgram = sProgram and sProgram.strip() or None
 
-				# Else, set it to null
-				else:
-					d.supervisor = None
-
-			# Else, set it to null
-			else:
-				d.supervisor = None
+			# If we couldn't fetch the programs, move on
+			if lPrograms is None:
+				continue
 
 			# If we have a specific value
-			if d.supervisor:
-				if d.supervisor not in lPrograms:
+			if sProgram:
+				if sProgram not in lPrograms:
 					lErrors.append(
-						[ 'record.services.%s.supervisor' % k,
-	   						'not a valid supervisor program' ]
+						( f'record.services.{k}.supervisor',
+	   						'not a valid supervisor program' )
 					)
 
 			# Else, check the main name
 			else:
 				if k not in lPrograms:
 					lErrors.append(
-						[ 'record.services.%s' % k,
-					 		'not a valid supervisor program' ]
+						( f'record.services.{k}',
+					 		'not a valid supervisor program' )
 					)
 
 		# If there's errors
 		if lErrors:
 			return Error(errors.DATA_FIELDS, lErrors)
 
-		# Copy the config
-		dConf = clone(self._conf)
-
-		# Add the new entry
-		dConf.rest[name] = data
+		# Add the new entry directly to the config, the existing entry, if any,
+		#	is still in dPrevious in case we need to roll back
+		self._conf.rest[name] = data
 
 		# Store the conf
 		try:
-			jsonb.store(dConf, self._path, 2)
+			self._store(self._conf)
+
+		# If we couldn't, restore the previous entry
 		except Exception as e:
+			if dPrevious is None:
+				del self._conf.rest[name]
+			else:
+				self._conf.rest[name] = dPrevious
 			return Error(errors.DB_CREATE_FAILED, str(e))
 
-		# Update the local variables
-		self._conf = dConf
-
 		# Return OK
 		return Response(True)
 
@@ -826,19 +1020,40 @@ class Manage(Service):
 			Manage
 		"""
 
-		# Generate the definitions path
-		sDefine = '%s/define' % Path(__file__).parent.resolve()
-
-		# Load the rest and portal Parents
-		self._rest = Parent.from_file('%s/rest.json' % sDefine)
-		self._portal = Parent.from_file('%s/portal.json' % sDefine)
+		# Get the rest and portal Parents
+		self._rest = _definition('rest.json')
+		self._portal = _definition('portal.json')
 
 		# Store the name of the file
 		self._path = config.manage.config('../.data/manage.json')
 		self._git = config.manage.git('/usr/bin/git')
 
-		# Fetch the configuration and store it as a jobject
-		self._conf = jobject( jsonb.load( self._path ) )
+		# Store how long, in seconds, the list of supervisor programs is good
+		#	for, and clear out any existing list
+		self._supervisor_ttl = config.manage.supervisor_ttl(5.0)
+		self._supervisor_cache = None
+
+		# Store the path to supervisord's UNIX socket, the XML-RPC connection
+		#	to it is only made once it's needed
+		self._supervisor_socket = config.manage.supervisor_socket(
+			'/var/run/supervisor.sock'
+		)
+		self._supervisor = None
+
+		# Store the nvm folders, and clear out any aliases already seen
+		self._nvm_dir = self._real(environ.get('NVM_DIR') or '~/.nvm')
+		self._nvm_alias_dir = join(self._nvm_dir, 'alias')
+		self._nvm_alias_seen = set()
+
+		# Fetch the current state of the config file
+		tStat = self._stat()
+
+		# If we've never loaded the file, or it's changed since we last did,
+		#	fetch the configuration and store it as a jobject
+		if tStat is None or tStat != getattr(self, '_conf_stat', None):
+			with open(self._path, 'rb') as oF:
+				self._conf = jobject( orjson.loads( oF.read() ) )
+			self._conf_stat = tStat
 
 		# Return self for chaining
 		return self
@@ -865,7 +1080,7 @@ class Manage(Service):
 		try: evaluate(req.data, [ 'name' ])
 		except ValueError as e:
 			return Error(
-				errors.DATA_FIELDS, [ [ f, 'missing' ] for f in e.args ]
+				errors.DATA_FIELDS, [ ( f, 'missing' ) for f in e.args ]
 			)
 
 		# If the rest doesn't exist
@@ -878,15 +1093,8 @@ class Manage(Service):
 		# Init return
 		dRet = jobject({})
 
-		# Copy the folder
-		sDir = dPortal.path
-
-		# If the rest has ~
-		if '~' in sDir:
-			sDir = expanduser(sDir)
-
-		# Make it an absolute path
-		sDir = abspath(sDir)
+		# Get the absolute path to the folder
+		sDir = self._real(dPortal.path)
 
 		# Get the repo up to date
 		try:
@@ -951,24 +1159,8 @@ class Manage(Service):
 			Response
 		"""
 
-		# Verify the permissions
-		access.verify(
-			req.session, { 'name': 'manage_rest', 'right': access.CREATE }
-		)
-
-		# Verify minimum data
-		try: evaluate(req.data, [ 'name', 'record' ])
-		except ValueError as e:
-			return Error(
-				errors.DATA_FIELDS, [ [ f, 'missing' ] for f in e.args ]
-			)
-
-		# If there's another rest with that name
-		if req.data.name in self._conf.rest:
-			return Error(errors.DB_DUPLICATE, [ req.data.name, 'rest' ])
-
-		# Call and return the validation methods
-		return self._rest_validation(req.data.name, req.data.record)
+		# Create the entry
+		return self._entry_create(req, 'rest', self._rest_validation)
 
 	def rest_delete(self, req: jobject) -> Response:
 		"""Portal delete
@@ -983,39 +1175,8 @@ class Manage(Service):
 			Response
 		"""
 
-		# Verify the permissions
-		access.verify(
-			req.session, { 'name': 'manage_rest', 'right': access.DELETE }
-		)
-
-		# Verify minimum data
-		try: evaluate(req.data, [ 'name' ])
-		except ValueError as e:
-			return Error(
-				errors.DATA_FIELDS, [ [ f, 'missing' ] for f in e.args ]
-			)
-
-		# If the rest doesn't exist
-		if req.data.name not in self._conf.rest:
-			return Error(errors.DB_NO_RECORD, [ req.data.name, 'rest' ])
-
-		# Copy the config
-		dConf = clone(self._conf)
-
-		# Delete the rest
-		del dConf.rest[req.data.name]
-
-		# Store the conf
-		try:
-			jsonb.store(dConf, self._path, 2)
-		except Exception as e:
-			return Error(errors.DB_CREATE_FAILED, str(e))
-
-		# Update the local variables
-		self._conf = dConf
-
-		# Return OK
-		return Response(True)
+		# Delete the entry
+		return self._entry_delete(req, 'rest')
 
 	def rest_read(self, req: jobject) -> Response:
 		"""REST read
@@ -1030,13 +1191,8 @@ class Manage(Service):
 			Response
 		"""
 
-		# Verify the permissions
-		access.verify(
-			req.session, { 'name': 'manage_rest', 'right': access.READ }
-		)
-
-		# Return the services
-		return Response(self._conf.rest)
+		# Return the entries
+		return self._entry_read(req, 'rest')
 
 	def rest_update(self, req: jobject) -> Response:
 		"""REST update
@@ -1051,33 +1207,168 @@ class Manage(Service):
 			Response
 		"""
 
-		# Verify the permissions
-		access.verify(
-			req.session, { 'name': 'manage_rest', 'right': access.UPDATE }
+		# Update the entry
+		return self._entry_update(
+			req, 'rest', self._rest_merge, self._rest_validation
 		)
 
-		# Verify minimum data
-		try: evaluate(req.data, [ 'name', 'record' ])
-		except ValueError as e:
-			return Error(
-				errors.DATA_FIELDS, [ [ f, 'missing' ] for f in e.args ]
-			)
+	def _stat(self) -> tuple | None:
+		"""Stat
 
-		# If the rest doesn't exist
-		if req.data.name not in self._conf.rest:
-			return Error(errors.DB_NO_RECORD, [ req.data.name, 'rest' ])
+		Returns a key made up of the config's path, modified time, and size, \
+		used to know if the file has changed since we last read or wrote it
 
-		# Make a new record from the old and new data
-		dRest = combine(self._conf.rest[req.data.name], req.data.record)
+		Returns:
+			tuple | None
+		"""
+		try:
+			oStat = stat(self._path)
+		except OSError:
+			return None
+		return ( self._path, oStat.st_mtime_ns, oStat.st_size )
 
-		# If we specifically changed services
-		if 'services' in req.data.record:
-			dRest['services'] = req.data.record.services
+	def _store(self, conf: dict) -> None:
+		"""Store
+
+		Encodes the config in memory, writes it to a uniquely named temporary \
+		file in a single write, syncs it to disk, moves it over the original, \
+		and syncs the folder, so a failed write can never leave a partial \
+		config behind. Symlinks are followed, and the original file's mode is \
+		kept. Then updates the stored stat key so that a reset doesn't \
+		needlessly reload what we just wrote
+
+		Arguments:
+			conf (dict): The config to store
+
+		Raises:
+			Exception
+
+		Returns:
+			None
+		"""
+
+		# Encode the config
+		bConf = orjson.dumps(
+			conf,
+			option = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+		)
+
+		# Resolve any symlinks so we replace the file itself and not the link
+		sTarget = realpath(self._path)
+		sFolder = dirname(sTarget)
+
+		# Fetch the current file's stats, if it exists, so they can be kept
+		try:
+			oStat = stat(sTarget)
+		except FileNotFoundError:
+			oStat = None
+
+		# Create a uniquely named temporary file beside the original. It's
+		#	created exclusively and only readable by us, so the config is never
+		#	readable by anyone who can't read the original
+		iFile, sTemp = mkstemp(
+			dir = sFolder, prefix = '%s.' % basename(sTarget), suffix = '.tmp'
+		)
+
+		# Set the original's mode, and owner if allowed, before writing
+		#	anything, then write the config in one go, make sure it's on disk,
+		#	and replace the original with the new file
+		try:
+			with fdopen(iFile, 'wb') as oF:
+				fchmod(iFile, S_IMODE(oStat.st_mode) if oStat else 0o644)
+				if oStat:
+					try:
+						fchown(iFile, oStat.st_uid, oStat.st_gid)
+					except PermissionError:
+						pass
+				oF.write(bConf)
+				oF.flush()
+				fsync(iFile)
+			replace(sTemp, sTarget)
+
+		# If anything failed, don't leave the temporary file behind
+		except Exception:
+			try:
+				remove(sTemp)
+			except OSError:
+				pass
+			raise
+
+		# Sync the folder so the rename itself survives a crash
+		iFolder = os_open(sFolder, O_RDONLY)
+		try:
+			fsync(iFolder)
+		finally:
+			close(iFolder)
+
+		# Store the new stat key
+		self._conf_stat = self._stat()
+
+	def _supervisor_programs(self) -> frozenset:
+		"""Supervisor Programs
+
+		Returns the names of the programs available in supervisor, asking \
+		supervisord directly over its socket, or falling back to supervisorctl \
+		if that fails. The list is kept for a few seconds so that back to back \
+		validations don't each have to ask again. The names are returned as a \
+		set so each service can be checked against them in constant time
+
+		Raises:
+			OSError
+			subprocess.CalledProcessError
+
+		Returns:
+			frozenset
+		"""
+
+		# Get the current time
+		fNow = monotonic()
+
+		# If we have a cached list and it's still fresh, return it
+		if self._supervisor_cache and \
+			fNow - self._supervisor_cache[0] < self._supervisor_ttl:
+			return self._supervisor_cache[1]
+
+		# Only import what's needed to talk to supervisord once we actually
+		#	have to, most workers never validate a REST entry
+		from http.client import HTTPException
+		from xml.parsers.expat import ExpatError
+		from xmlrpc.client import Error as XmlRpcError, ServerProxy
+		from .supervisor import UnixStreamTransport
+
+		# Fetch the config of every program from supervisord and store the
+		#	names the same way supervisorctl does, with the group if it differs
+		try:
+
+			# If we don't have a connection yet, create it
+			if not self._supervisor:
+				self._supervisor = ServerProxy(
+					'http://localhost',
+					transport = UnixStreamTransport(self._supervisor_socket)
+				)
+
+			# Fetch the programs
+			lPrograms = frozenset(
+				d['group'] == d['name'] and d['name'] or \
+					'%s:%s' % ( d['group'], d['name'] ) \
+				for d in self._supervisor.supervisor.getAllConfigInfo()
+			)
+
+		# If the socket is missing, supervisord refused the request, or the
+		#	reply couldn't be read
+		except ( ExpatError, HTTPException, OSError, XmlRpcError ):
+
+			# Fetch the list of supervisor programs from supervisorctl
+			lOut = subprocess.run(
+				[ 'supervisorctl', 'avail' ],
+				capture_output = True,
+				check = True,
+				text = True
+			).stdout.splitlines()
 
-		# If any services are None, delete them
-		for s in list(dRest.services.keys()):
-			if dRest.services[s] == None:
-				del dRest.services[s]
+			# Go though each line and store just the name of the program
+			lPrograms = frozenset( s.split(' ', 1)[0] for s in lOut if s )
 
-		# Call and return the validation methods
-		return self._rest_validation(req.data.name, dRest)
\ No newline at end of file
+		# Cache the list and return it
+		self._supervisor_cache = ( fNow, lPrograms )
+		return lPrograms
@@ -0,0 +1,94 @@
+# coding=utf8
+""" Supervisor
+
+Allows talking to supervisord's XML-RPC interface directly over its UNIX socket
+"""
+
+__author__		= "Chris Nasr"
+__copyright__	= "Ouroboros Coding Inc."
+__version__		= "1.0.0"
+__email__		= "chris@ouroboroscoding.com"
+__created__		= "2026-10-14"
+
+# Limit exports
+__all__ = [ 'UnixStreamTransport' ]
+
+# Python imports
+from http.client import HTTPConnection
+import socket
+from xmlrpc.client import Transport
+
+class UnixStreamHTTPConnection(HTTPConnection):
+	"""Unix Stream HTTP Connection
+
+	HTTP connection that connects to a UNIX socket instead of a host and port
+	"""
+
+	def __init__(self, path: str, timeout: float):
+		"""Constructor
+
+		Creates a new instance of the connection
+
+		Arguments:
+			path (str): The path to the UNIX socket
+			timeout (float): The seconds to wait on the socket before failing
+
+		Returns:
+			UnixStreamHTTPConnection
+		"""
+		super().__init__('localhost', timeout = timeout)
+		self._socket_path = path
+
+	def connect(self):
+		"""Connect
+
+		Opens the connection to the UNIX socket
+
+		Returns:
+			None
+		"""
+		self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		self.sock.settimeout(self.timeout)
+		self.sock.connect(self._socket_path)
+
+class UnixStreamTransport(Transport):
+	"""Unix Stream Transport
+
+	XML-RPC transport that sends requests over a UNIX socket, keeping the \
+	connection open between requests
+	"""
+
+	def __init__(self, path: str, timeout: float = 5.0):
+		"""Constructor
+
+		Creates a new instance of the transport
+
+		Arguments:
+			path (str): The path to the UNIX socket
+			timeout (float): Optional, the seconds to wait on the socket \
+				before failing
+
+		Returns:
+			UnixStreamTransport
+		"""
+		super().__init__()
+		self._socket_path = path
+		self._timeout = timeout
+
+	def make_connection(self, host: str) -> UnixStreamHTTPConnection:
+		"""Make Connection
+
+		Returns the existing connection, or creates a new one
+
+		Arguments:
+			host (str): The host from the ServerProxy URI, unused
+
+		Returns:
+			UnixStreamHTTPConnection
+		"""
+		if self._connection and host == self._connection[0]:
+			return self._connection[1]
+		self._connection = host, UnixStreamHTTPConnection(
+			self._socket_path, self._timeout
+		)
+		return self._connection[1]